@@ -11,13 +11,113 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from fcc_hard_carbon import (
-    Feedstock, ProcessConditions, HardCarbonPredictor, GoldilocksAnalyzer,
-    ProcessOptimizer, SensitivityAnalyzer, generate_contour_data,
-    EconomicsCalculator
+    Feedstock, HardCarbonPredictor, HardCarbonResult,
+    GoldilocksAnalyzer, ProcessOptimizer,
+    generate_contour_data, EconomicsCalculator
 )
 
 st.set_page_config(page_title="FCC Hard Carbon Optimizer", page_icon="🔋", layout="wide")
 
+# ===== CACHED HELPERS =====
+
+# The predictor/analyzer are stateless; share one instance across all
+# reruns and sessions instead of reconstructing them per slider move.
+
+@st.cache_resource
+def get_predictor():
+    return HardCarbonPredictor()
+
+@st.cache_resource
+def get_analyzer():
+    return GoldilocksAnalyzer()
+
+# Streamlit re-runs this script top-to-bottom on every widget change.
+# Memoize the expensive computations on their scalar inputs so moving an
+# unrelated slider (e.g. economics) doesn't recompute contours/optimization.
+
+@st.cache_data(max_entries=32)
+def _contour_cached(sulfur, oxygen, aromatics, mcr, n=25):
+    feed = Feedstock(sulfur_wt_pct=sulfur, oxygen_wt_pct=oxygen,
+                     aromatics_pct=aromatics, mcr_wt_pct=mcr)
+    return generate_contour_data(feed, n=n)
+
+@st.cache_data(max_entries=32)
+def _contour_figs_cached(sulfur, oxygen, aromatics, mcr, n=25):
+    # Building + serializing the Contour traces dominates the tab-4
+    # render time, so cache the finished figures, not just the grid.
+    data = _contour_cached(sulfur, oxygen, aromatics, mcr, n=n)
+
+    fig1 = go.Figure()
+    fig1.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['d002'],
+                               colorscale='Viridis', contours=dict(showlabels=True),
+                               colorbar=dict(title='d002 (nm)')))
+    fig1.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['d002'],
+                               contours=dict(start=0.37, end=0.37, size=0.001, coloring='lines'),
+                               line=dict(color='lime', width=3), showscale=False))
+    fig1.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['d002'],
+                               contours=dict(start=0.40, end=0.40, size=0.001, coloring='lines'),
+                               line=dict(color='red', width=3), showscale=False))
+    fig1.update_layout(title="d002 Interlayer Spacing", xaxis_title="Temperature (°C)",
+                       yaxis_title="Sulfur (%)", height=450)
+
+    fig2 = go.Figure()
+    fig2.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['capacity'],
+                               colorscale='RdYlGn', contours=dict(showlabels=True),
+                               colorbar=dict(title='mAh/g')))
+    fig2.update_layout(title="Reversible Capacity", xaxis_title="Temperature (°C)",
+                       yaxis_title="Sulfur (%)", height=450)
+    return fig1, fig2
+
+@st.cache_data(max_entries=64)
+def _shared_eval(sulfur, oxygen, aromatics, mcr, temp_C, rate_C_min, time_hr):
+    """
+    Fused evaluation for the Predict and Sensitivity tabs: row 0 is the
+    base case, rows 1-8 the ±20% perturbations, all dispatched in one
+    predict_batch call per rerun instead of one call per tab.
+    """
+    feed = Feedstock(sulfur_wt_pct=sulfur, oxygen_wt_pct=oxygen,
+                     aromatics_pct=aromatics, mcr_wt_pct=mcr)
+    lo, hi = 0.8, 1.2
+    # Explicit float64: the temperature slider yields an int, and an
+    # int64 array would silently truncate the perturbed values below
+    temps = np.full(9, temp_C, dtype=np.float64)
+    rates = np.full(9, rate_C_min, dtype=np.float64)
+    times = np.full(9, time_hr, dtype=np.float64)
+    sulfurs = np.full(9, sulfur, dtype=np.float64)
+    temps[1:3] = temp_C * lo, temp_C * hi
+    rates[3:5] = max(1, rate_C_min * lo), min(20, rate_C_min * hi)
+    times[5:7] = max(0.5, time_hr * lo), min(6, time_hr * hi)
+    sulfurs[7:9] = max(1, sulfur * lo), min(6, sulfur * hi)
+
+    d002, cap, ice, bet, yld = get_predictor().predict_batch(
+        feed, temps, rates, times, sulfur=sulfurs)
+
+    result = HardCarbonResult(
+        d002_nm=round(d002[0], 4), capacity_mAh_g=round(cap[0], 1),
+        ice_pct=round(ice[0], 1), bet_m2_g=round(bet[0], 1),
+        yield_pct=round(yld[0], 1))
+
+    deltas = d002[1:] - d002[0]
+    params = ['Temperature', 'Heating Rate', 'Hold Time', 'Sulfur']
+    sens_results = [{'param': params[i], 'low': deltas[2*i], 'high': deltas[2*i+1],
+                     'impact': abs(deltas[2*i+1] - deltas[2*i])} for i in range(4)]
+    sens_results.sort(key=lambda r: r['impact'], reverse=True)
+    return result, d002[0], sens_results
+
+@st.cache_data(max_entries=32)
+def _optimize_cached(sulfur, oxygen, aromatics, mcr, n_samples, top_n):
+    feed = Feedstock(sulfur_wt_pct=sulfur, oxygen_wt_pct=oxygen,
+                     aromatics_pct=aromatics, mcr_wt_pct=mcr)
+    opt = ProcessOptimizer(feed)
+    top = opt.optimize(n_samples, top_n)
+    return top, opt.get_stats()
+
+@st.cache_data(max_entries=32)
+def _economics_cached(fcc_tpy, yield_pct):
+    econ = EconomicsCalculator(fcc_tpy, yield_pct)
+    return (econ.get_capex(), econ.get_opex(), econ.get_revenue(),
+            econ.get_npv_irr(), econ.scenarios())
+
 # ===== SIDEBAR =====
 st.sidebar.title("🔋 FCC Hard Carbon")
 st.sidebar.markdown("**Na-ion Battery Anode Optimizer**")
@@ -37,11 +137,14 @@ st.sidebar.header("💰 Economics")
 fcc_tpy = st.sidebar.number_input("FCC Oil (TPY)", 1000, 50000, 10000, 1000)
 yield_pct = st.sidebar.slider("Char Yield (%)", 25, 45, 35, 1)
 
-# Create objects
-feed = Feedstock(sulfur_wt_pct=sulfur, oxygen_wt_pct=oxygen, aromatics_pct=aromatics, mcr_wt_pct=mcr)
-proc = ProcessConditions(temp_C=temp, rate_C_min=rate, time_hr=hold_time)
-predictor = HardCarbonPredictor()
-analyzer = GoldilocksAnalyzer()
+# Shared analyzer for the diagnostics section; the cached helpers above
+# build their own Feedstock from the slider values.
+analyzer = get_analyzer()
+
+# One fused (and cached) evaluation feeds both the Predict and
+# Sensitivity tabs below.
+result, base_d002, sens_results = _shared_eval(sulfur, oxygen, aromatics, mcr,
+                                               temp, rate, hold_time)
 
 # ===== MAIN CONTENT =====
 tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎯 Predict", "🔍 Optimize", "📊 Sensitivity", "🗺️ Contours", "💰 Economics"])
@@ -49,9 +152,7 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(["🎯 Predict", "🔍 Optimize", "📊 S
 # ===== TAB 1: PREDICT =====
 with tab1:
     st.header("Property Prediction")
-    
-    result = predictor.predict(feed, proc)
-    
+
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -105,20 +206,25 @@ with tab2:
     
     if run_opt:
         with st.spinner(f"Sampling {n_samples} conditions..."):
-            opt = ProcessOptimizer(feed)
-            top_results = opt.optimize(n_samples, top_n)
-            stats = opt.get_stats()
+            top_results, stats = _optimize_cached(sulfur, oxygen, aromatics, mcr,
+                                                  n_samples, top_n)
         
         st.success(f"Found {stats['goldilocks']}/{stats['total']} in Goldilocks ({stats['rate_pct']:.1f}%)")
         
         if top_results:
             st.subheader(f"🏆 Top {len(top_results)} Conditions")
             
-            df = pd.DataFrame([{
-                'Rank': i+1, 'Temp (°C)': r.temp_C, 'Rate (°C/min)': r.rate_C_min,
-                'Time (hr)': r.time_hr, 'd002 (nm)': r.d002_nm, 'Capacity': r.capacity,
-                'ICE (%)': r.ice_pct, 'Score': r.score
-            } for i, r in enumerate(top_results)])
+            # Column-wise (SoA) construction — no per-row dict inference
+            df = pd.DataFrame({
+                'Rank': np.arange(1, len(top_results) + 1),
+                'Temp (°C)': [r.temp_C for r in top_results],
+                'Rate (°C/min)': [r.rate_C_min for r in top_results],
+                'Time (hr)': [r.time_hr for r in top_results],
+                'd002 (nm)': [r.d002_nm for r in top_results],
+                'Capacity': [r.capacity for r in top_results],
+                'ICE (%)': [r.ice_pct for r in top_results],
+                'Score': [r.score for r in top_results],
+            })
             
             st.dataframe(df, use_container_width=True, hide_index=True)
             
@@ -129,10 +235,9 @@ with tab2:
 with tab3:
     st.header("Sensitivity Analysis")
     
-    sens = SensitivityAnalyzer(feed, proc)
-    results = sens.analyze()
-    
-    st.info(f"Base case: d002 = {sens.base_d002:.4f} nm")
+    results = sens_results
+
+    st.info(f"Base case: d002 = {base_d002:.4f} nm")
     
     params = [r['param'] for r in results]
     lows = [r['low'] * 1000 for r in results]
@@ -154,43 +259,21 @@ with tab4:
     st.header("Process Maps")
     
     with st.spinner("Generating contour data..."):
-        data = generate_contour_data(feed, n=25)
-    
+        fig1, fig2 = _contour_figs_cached(sulfur, oxygen, aromatics, mcr, n=25)
+
     col1, col2 = st.columns(2)
-    
+
     with col1:
-        fig1 = go.Figure()
-        fig1.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['d002'],
-                                   colorscale='Viridis', contours=dict(showlabels=True),
-                                   colorbar=dict(title='d002 (nm)')))
-        fig1.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['d002'],
-                                   contours=dict(start=0.37, end=0.37, size=0.001, coloring='lines'),
-                                   line=dict(color='lime', width=3), showscale=False))
-        fig1.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['d002'],
-                                   contours=dict(start=0.40, end=0.40, size=0.001, coloring='lines'),
-                                   line=dict(color='red', width=3), showscale=False))
-        fig1.update_layout(title="d002 Interlayer Spacing", xaxis_title="Temperature (°C)",
-                           yaxis_title="Sulfur (%)", height=450)
         st.plotly_chart(fig1, use_container_width=True)
-    
+
     with col2:
-        fig2 = go.Figure()
-        fig2.add_trace(go.Contour(x=data['temps'], y=data['sulfurs'], z=data['capacity'],
-                                   colorscale='RdYlGn', contours=dict(showlabels=True),
-                                   colorbar=dict(title='mAh/g')))
-        fig2.update_layout(title="Reversible Capacity", xaxis_title="Temperature (°C)",
-                           yaxis_title="Sulfur (%)", height=450)
         st.plotly_chart(fig2, use_container_width=True)
 
 # ===== TAB 5: ECONOMICS =====
 with tab5:
     st.header("Business Case Analysis")
     
-    econ = EconomicsCalculator(fcc_tpy, yield_pct)
-    capex = econ.get_capex()
-    opex = econ.get_opex()
-    rev = econ.get_revenue()
-    fin = econ.get_npv_irr()
+    capex, opex, rev, fin, scenarios = _economics_cached(fcc_tpy, yield_pct)
     
     col1, col2, col3, col4 = st.columns(4)
     col1.metric("NPV", f"₹{fin['npv_cr']:.0f} Cr", f"IRR: {fin['irr_pct']:.0f}%")
@@ -210,7 +293,6 @@ with tab5:
     
     with col2:
         st.subheader("📊 Price Sensitivity")
-        scenarios = econ.scenarios()
         df_scen = pd.DataFrame(scenarios)
         df_scen.columns = ['Change', '₹/kg', 'NPV (Cr)', 'IRR (%)', 'Payback']
         st.dataframe(df_scen, use_container_width=True, hide_index=True)
@@ -4,8 +4,11 @@ import argparse
 import sys
 from pathlib import Path
 
+import numpy as np
+
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+from fcc_hard_carbon.models import quality_score_batch
 from fcc_hard_carbon import (
     Feedstock, ProcessConditions, HardCarbonPredictor, GoldilocksAnalyzer,
     ProcessOptimizer, SensitivityAnalyzer, generate_contour_data,
@@ -123,10 +126,15 @@ def main():
         print(f"{'='*65}")
         print(f"{'Temp':>6} | {'d002':>7} | {'Goldilocks':>10} | {'Cap':>6} | {'Score':>5}")
         print("-"*55)
-        for T in range(900, 1301, 50):
-            r = pred.predict(feed, ProcessConditions(temp_C=T, rate_C_min=args.rate, time_hr=args.time))
-            gl = "✓ YES" if r.in_goldilocks else "  no"
-            print(f"{T:>6} | {r.d002_nm:>7.4f} | {gl:>10} | {r.capacity_mAh_g:>6.1f} | {r.quality_score:>5.1f}")
+        # One vectorized call over all sweep temperatures
+        Ts = np.arange(900, 1301, 50, dtype=np.float64)
+        d002, cap, ice, bet, yld = pred.predict_batch(
+            feed, Ts, np.full(Ts.shape, args.rate), np.full(Ts.shape, args.time))
+        in_gl = (d002 >= 0.37) & (d002 <= 0.40)
+        scores = quality_score_batch(d002, cap, ice, yld)
+        for i in range(len(Ts)):
+            gl = "✓ YES" if in_gl[i] else "  no"
+            print(f"{int(Ts[i]):>6} | {d002[i]:>7.4f} | {gl:>10} | {cap[i]:>6.1f} | {scores[i]:>5.1f}")
         print(f"{'='*65}\n")
         return
     
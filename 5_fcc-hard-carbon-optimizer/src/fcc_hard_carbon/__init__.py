@@ -27,25 +27,36 @@ CLI Usage:
 __version__ = "1.0.0"
 __author__ = "FCC Hard Carbon Contributors"
 
-from .models import (
-    Feedstock,
-    ProcessConditions,
-    HardCarbonResult,
-    HardCarbonPredictor,
-    GoldilocksAnalyzer,
-)
+# Lazy re-exports (PEP 562): submodules load on first attribute access,
+# so e.g. `fcc-hard-carbon --economics` never pays for numpy-heavy
+# optimization imports it doesn't use.
+_EXPORTS = {
+    # Models
+    'Feedstock': 'models',
+    'ProcessConditions': 'models',
+    'HardCarbonResult': 'models',
+    'HardCarbonPredictor': 'models',
+    'GoldilocksAnalyzer': 'models',
+    # Optimization
+    'ProcessOptimizer': 'optimization',
+    'SensitivityAnalyzer': 'optimization',
+    'OptResult': 'optimization',
+    'generate_contour_data': 'optimization',
+    # Economics
+    'EconomicsCalculator': 'economics',
+    'PlantScale': 'economics',
+}
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        from importlib import import_module
+        return getattr(import_module('.' + _EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from .optimization import (
-    ProcessOptimizer,
-    SensitivityAnalyzer,
-    OptResult,
-    generate_contour_data,
-)
 
-from .economics import (
-    EconomicsCalculator,
-    PlantScale,
-)
+def __dir__():
+    return sorted(set(__all__) | set(globals()))
 
 __all__ = [
     # Version
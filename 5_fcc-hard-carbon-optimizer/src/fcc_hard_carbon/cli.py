@@ -10,13 +10,12 @@ Usage:
 import argparse
 import sys
 
-from .models import Feedstock, ProcessConditions, HardCarbonPredictor, GoldilocksAnalyzer
-from .optimization import ProcessOptimizer, SensitivityAnalyzer
-from .economics import EconomicsCalculator
+# Heavy imports (numpy, the predictor kernels) happen inside the mode
+# branches below so that e.g. --economics runs don't pay for them.
 
 
-def main():
-    """Main entry point for CLI."""
+def _build_parser() -> argparse.ArgumentParser:
+    """Construct the CLI argument parser (done once at import)."""
     p = argparse.ArgumentParser(
         prog='fcc-hard-carbon',
         description='FCC Hard Carbon Optimizer - Na-ion Battery Anode Material',
@@ -80,9 +79,17 @@ Examples:
                           help='Char yield (%%), default: 35')
     opt_group.add_argument('--json', action='store_true',
                           help='Output results as JSON')
-    
-    args = p.parse_args()
-    
+
+    return p
+
+
+_PARSER = _build_parser()
+
+
+def main():
+    """Main entry point for CLI."""
+    args = _PARSER.parse_args()
+
     # JSON output helper
     if args.json:
         import json
@@ -107,6 +114,8 @@ Examples:
     
     # ===== ECONOMICS =====
     if args.economics or args.scenarios:
+        from .economics import EconomicsCalculator
+
         econ = EconomicsCalculator(args.fcc_tpy, args.yield_pct)
         capex = econ.get_capex()
         opex = econ.get_opex()
@@ -141,12 +150,16 @@ Examples:
         return 0
     
     # Create feedstock and predictor
+    from .models import Feedstock, ProcessConditions, HardCarbonPredictor
+
     feed = Feedstock(sulfur_wt_pct=args.sulfur, oxygen_wt_pct=args.oxygen,
                      aromatics_pct=args.aromatics, mcr_wt_pct=args.mcr)
     pred = HardCarbonPredictor()
-    
+
     # ===== OPTIMIZE =====
     if args.optimize:
+        from .optimization import ProcessOptimizer
+
         opt = ProcessOptimizer(feed)
         top = opt.optimize(args.samples, args.top)
         stats = opt.get_stats()
@@ -178,6 +191,8 @@ Examples:
     
     # ===== SENSITIVITY =====
     if args.sensitivity:
+        from .optimization import SensitivityAnalyzer
+
         base = ProcessConditions(temp_C=args.temp, rate_C_min=args.rate, time_hr=args.time)
         sens = SensitivityAnalyzer(feed, base)
         results = sens.analyze()
@@ -199,28 +214,37 @@ Examples:
     
     # ===== SWEEP =====
     if args.sweep:
+        import numpy as np
+
+        from .models import quality_score_batch
+
+        # One vectorized call over all sweep temperatures
+        Ts = np.arange(900, 1301, 50, dtype=np.float64)
+        d002, cap, ice, bet, yld = pred.predict_batch(
+            feed, Ts, np.full(Ts.shape, args.rate), np.full(Ts.shape, args.time))
+        in_gl = (d002 >= 0.37) & (d002 <= 0.40)
+        scores = quality_score_batch(d002, cap, ice, yld)
+
         if args.json:
-            results = []
-            for T in range(900, 1301, 50):
-                r = pred.predict(feed, ProcessConditions(temp_C=T, rate_C_min=args.rate, time_hr=args.time))
-                results.append({'temp': T, 'd002': r.d002_nm, 'in_goldilocks': r.in_goldilocks,
-                               'capacity': r.capacity_mAh_g, 'score': r.quality_score})
-            output(results)
+            output([{'temp': int(Ts[i]), 'd002': round(d002[i], 4), 'in_goldilocks': bool(in_gl[i]),
+                     'capacity': round(cap[i], 1), 'score': scores[i]}
+                    for i in range(len(Ts))])
         else:
             print(f"\n{'='*65}")
             print("TEMPERATURE SWEEP")
             print(f"{'='*65}")
             print(f"{'Temp':>6} | {'d002':>7} | {'Goldilocks':>10} | {'Cap':>6} | {'Score':>5}")
             print("-"*55)
-            for T in range(900, 1301, 50):
-                r = pred.predict(feed, ProcessConditions(temp_C=T, rate_C_min=args.rate, time_hr=args.time))
-                gl = "✓ YES" if r.in_goldilocks else "  no"
-                print(f"{T:>6} | {r.d002_nm:>7.4f} | {gl:>10} | {r.capacity_mAh_g:>6.1f} | {r.quality_score:>5.1f}")
+            for i in range(len(Ts)):
+                gl = "✓ YES" if in_gl[i] else "  no"
+                print(f"{int(Ts[i]):>6} | {d002[i]:>7.4f} | {gl:>10} | {cap[i]:>6.1f} | {scores[i]:>5.1f}")
             print(f"{'='*65}\n")
         return 0
     
     # ===== FIND WINDOW =====
     if args.find_window:
+        from .models import GoldilocksAnalyzer
+
         analyzer = GoldilocksAnalyzer()
         w = analyzer.find_temp_window(feed, args.rate, args.time)
         
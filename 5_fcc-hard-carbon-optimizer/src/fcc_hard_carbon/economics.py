@@ -1,5 +1,4 @@
 """FCC Hard Carbon Optimizer - Session 3: Economics"""
-import numpy as np
 from dataclasses import dataclass
 from typing import Dict, List
 
@@ -38,52 +37,80 @@ class EconomicsCalculator:
         # Revenue (INR/kg HC)
         self.prices = {'premium': 350, 'standard': 280, 'offspec': 120}
         self.grade_mix = {'premium': 0.30, 'standard': 0.55, 'offspec': 0.15}
-    
+
+        # Derived factors, fixed once the unit rates above are set
+        self._n2_factor = self.n2_per_t * self.n2_rate / 1e5         # Lakh per tpy feed
+        self._power_factor = self.power_per_t * self.power_rate / 1e5
+        self._labor_lakh = self.operators * self.salary
+        self._blended_price = sum(self.prices[g] * self.grade_mix[g] for g in self.prices)
+
+        # Memoized summaries — all inputs are fixed at construction, and
+        # get_npv_irr/scenarios would otherwise recompute the same CAPEX
+        # chain over a dozen times per business case.
+        self._capex = self._opex = self._revenue = None
+
     def get_capex(self) -> Dict:
-        equip = sum(self.capex.values())
-        installed = equip * self.install_factor
-        eng = installed * self.eng_pct
-        cont = (installed + eng) * self.contingency_pct
-        total = installed + eng + cont
-        return {'equipment_cr': equip, 'installed_cr': round(installed, 1),
-                'total_cr': round(total, 1)}
-    
+        if self._capex is None:
+            equip = sum(self.capex.values())
+            installed = equip * self.install_factor
+            eng = installed * self.eng_pct
+            cont = (installed + eng) * self.contingency_pct
+            total = installed + eng + cont
+            self._capex = {'equipment_cr': equip, 'installed_cr': round(installed, 1),
+                           'total_cr': round(total, 1)}
+        return self._capex
+
     def get_opex(self) -> Dict:
-        s = self.scale
-        n2 = s.fcc_oil_tpy * self.n2_per_t * self.n2_rate / 1e5        # Lakh
-        power = s.fcc_oil_tpy * self.power_per_t * self.power_rate / 1e5
-        labor = self.operators * self.salary
-        maint = self.get_capex()['total_cr'] * 100 * self.maint_pct    # Cr→Lakh
-        total = n2 + power + labor + maint
-        cost_per_kg = total * 1e5 / (s.hc_tpy * 1000)
-        return {'n2_lakh': round(n2,1), 'power_lakh': round(power,1),
-                'labor_lakh': round(labor,1), 'maint_lakh': round(maint,1),
-                'total_cr': round(total/100, 2), 'cost_per_kg': round(cost_per_kg, 1)}
-    
+        if self._opex is None:
+            s = self.scale
+            n2 = s.fcc_oil_tpy * self._n2_factor        # Lakh
+            power = s.fcc_oil_tpy * self._power_factor
+            labor = self._labor_lakh
+            maint = self.get_capex()['total_cr'] * 100 * self.maint_pct    # Cr→Lakh
+            total = n2 + power + labor + maint
+            cost_per_kg = total * 1e5 / (s.hc_tpy * 1000)
+            self._opex = {'n2_lakh': round(n2,1), 'power_lakh': round(power,1),
+                          'labor_lakh': round(labor,1), 'maint_lakh': round(maint,1),
+                          'total_cr': round(total/100, 2), 'cost_per_kg': round(cost_per_kg, 1)}
+        return self._opex
+
     def get_revenue(self) -> Dict:
-        blended = sum(self.prices[g] * self.grade_mix[g] for g in self.prices)
-        hc_kg = self.scale.hc_tpy * 1000
-        rev_cr = hc_kg * blended / 1e7
-        return {'hc_tpy': self.scale.hc_tpy, 'price_per_kg': round(blended, 0),
-                'revenue_cr': round(rev_cr, 2)}
+        if self._revenue is None:
+            blended = self._blended_price
+            hc_kg = self.scale.hc_tpy * 1000
+            rev_cr = hc_kg * blended / 1e7
+            self._revenue = {'hc_tpy': self.scale.hc_tpy, 'price_per_kg': round(blended, 0),
+                             'revenue_cr': round(rev_cr, 2)}
+        return self._revenue
     
     def get_npv_irr(self, rate: float = 0.12, years: int = 10, tax: float = 0.25) -> Dict:
-        capex = self.get_capex()['total_cr']
-        opex = self.get_opex()['total_cr']
-        rev = self.get_revenue()['revenue_cr']
-        
-        ebitda = rev - opex
-        depreciation = capex / years
+        return self._financials(self.get_revenue()['revenue_cr'],
+                                self.get_capex()['total_cr'],
+                                self.get_opex()['total_cr'],
+                                rate=rate, years=years, tax=tax)
+
+    def _financials(self, rev_cr: float, capex_cr: float, opex_cr: float,
+                    rate: float = 0.12, years: int = 10, tax: float = 0.25) -> Dict:
+        """
+        NPV/IRR/payback for explicit revenue/CAPEX/OPEX figures. Pure in
+        its inputs, so what-if analyses (price scenarios, parametric
+        sweeps) can perturb one figure without touching calculator state.
+        """
+        ebitda = rev_cr - opex_cr
+        depreciation = capex_cr / years
         ebt = ebitda - depreciation
         net_income = ebt * (1 - tax) if ebt > 0 else ebt
         cf = net_income + depreciation
-        
-        cfs = [-capex] + [cf] * years
-        npv = sum(c / (1 + rate)**t for t, c in enumerate(cfs))
-        
+
+        cfs = [-capex_cr] + [cf] * years
+        # Horner form: one divide per year instead of one pow per term
+        npv = 0.0
+        for c in reversed(cfs):
+            npv = c + npv / (1 + rate)
+
         # IRR
         irr = self._irr(cfs)
-        
+
         # Payback
         cum, payback = 0, years
         for t, c in enumerate(cfs):
@@ -91,39 +118,110 @@ class EconomicsCalculator:
             if cum >= 0:
                 payback = t
                 break
-        
-        return {'capex_cr': capex, 'ebitda_cr': round(ebitda, 2),
+
+        return {'capex_cr': capex_cr, 'ebitda_cr': round(ebitda, 2),
                 'cash_flow_cr': round(cf, 2), 'npv_cr': round(npv, 1),
                 'irr_pct': round(irr * 100, 1), 'payback_yr': payback}
     
-    def _irr(self, cfs: List[float]) -> float:
+    def _irr(self, cfs: List[float], tol: float = 1e-8, maxiter: int = 30) -> float:
+        # Every cash-flow series this model produces is a level annuity
+        # (one CAPEX outflow, then identical yearly flows), which has a
+        # cheap specialized solve; keep the generic Newton for anything
+        # else.
+        cf = cfs[1]
+        if cfs[0] < 0 and all(c == cf for c in cfs[1:]):
+            return self._irr_annuity(-cfs[0], cf, len(cfs) - 1, tol, maxiter)
         r = 0.1
-        for _ in range(50):
-            npv = sum(c / (1 + r)**t for t, c in enumerate(cfs))
-            dnpv = sum(-t * c / (1 + r)**(t+1) for t, c in enumerate(cfs))
-            if abs(dnpv) < 1e-10: break
-            r -= npv / dnpv
+        for _ in range(maxiter):
+            # Rolling discount factor: NPV and its derivative in one
+            # pass with no pow calls
+            g = 1 + r
+            npv = dnpv = 0.0
+            disc = 1.0                    # (1+r)^-t
+            for t, c in enumerate(cfs):
+                npv += c * disc
+                dnpv -= t * c * disc / g
+                disc /= g
+            if abs(dnpv) < 1e-10:
+                break
+            step = npv / dnpv
+            r -= step
+            if abs(step) < tol:
+                return max(0, min(r, 5))
+
+        # Newton stalled or diverged (flat or non-monotone NPV curve).
+        # Fall back to a bracketed solve, which cannot run away.
+        def npv_of(r):
+            npv = 0.0
+            for c in reversed(cfs):
+                npv = c + npv / (1 + r)
+            return npv
+
+        lo, hi = -0.99, 5.0
+        if npv_of(lo) * npv_of(hi) < 0:
+            from scipy.optimize import brentq  # lazy: keep plain economics scipy-free
+            return brentq(npv_of, lo, hi, xtol=tol)
+        return max(0, min(r, 5))  # no sign change on the bracket: no IRR in range
+
+    def _irr_annuity(self, capex: float, cf: float, n: int,
+                     tol: float = 1e-8, maxiter: int = 30) -> float:
+        """IRR of -capex followed by n equal flows: Newton on the annuity formula"""
+        if cf <= 0:
+            return 0.0          # never recovers the outflow
+        r = cf / capex          # exact in the n→∞ limit; good start
+        for _ in range(maxiter):
+            g = (1 + r) ** -n
+            f = cf * (1 - g) / r - capex
+            df = cf * (n * g / (r * (1 + r)) - (1 - g) / (r * r))
+            if abs(df) < 1e-12:
+                break
+            step = f / df
+            r -= step
+            if r <= 0:
+                r = 1e-6
+            if abs(step) < tol:
+                break
         return max(0, min(r, 5))
     
     def scenarios(self) -> List[Dict]:
         """Price sensitivity: -20%, -10%, Base, +10%, +20%"""
-        results = []
+        import numpy as np  # lazy: plain --economics stays numpy-free
+
+        rate, years, tax = 0.12, 10, 0.25
+        capex = self.get_capex()['total_cr']
+        opex = self.get_opex()['total_cr']
         base_price = self.get_revenue()['price_per_kg']
-        
-        for pct in [-20, -10, 0, 10, 20]:
-            factor = 1 + pct/100
-            # Temporarily adjust prices
-            old_prices = self.prices.copy()
-            self.prices = {k: v * factor for k, v in old_prices.items()}
-            
-            npv_irr = self.get_npv_irr()
+        blended = self._blended_price
+        hc_kg = self.scale.hc_tpy * 1000
+
+        # All five scenario cash-flow series as one (5, years+1) matrix,
+        # discounted in a single vectorized pass. Price scaling only
+        # affects revenue, so CAPEX/OPEX are computed once above.
+        pcts = [-20, -10, 0, 10, 20]
+        factors = 1 + np.array(pcts) / 100
+        revs = np.round(hc_kg * blended * factors / 1e7, 2)
+        ebitda = revs - opex
+        dep = capex / years
+        ebt = ebitda - dep
+        cf = np.where(ebt > 0, ebt * (1 - tax), ebt) + dep
+        cfs = np.empty((len(pcts), years + 1))
+        cfs[:, 0] = -capex
+        cfs[:, 1:] = cf[:, None]
+        npvs = (cfs / (1 + rate) ** np.arange(years + 1)).sum(axis=1)
+
+        results = []
+        for i, pct in enumerate(pcts):
+            cum, payback = 0.0, years
+            for t in range(years + 1):
+                cum += cfs[i, t]
+                if cum >= 0:
+                    payback = t
+                    break
             results.append({
                 'change': f"{pct:+d}%",
-                'price': round(base_price * factor, 0),
-                'npv_cr': npv_irr['npv_cr'],
-                'irr_pct': npv_irr['irr_pct'],
-                'payback': npv_irr['payback_yr']
+                'price': round(base_price * factors[i], 0),
+                'npv_cr': round(npvs[i], 1),
+                'irr_pct': round(self._irr(list(cfs[i])) * 100, 1),
+                'payback': payback
             })
-            
-            self.prices = old_prices
         return results
@@ -1,11 +1,21 @@
 """FCC Hard Carbon Optimizer - Core Models"""
-from dataclasses import dataclass, field
+import math
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Tuple, List, Dict, Optional
 import numpy as np
 
+try:
+    # Optional acceleration: numba JITs the predictor kernels below.
+    # Everything works (more slowly) without it.
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
 # ============== DATA CLASSES ==============
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Feedstock:
     """FCC Decant Oil Feedstock"""
     sulfur_wt_pct: float = 3.5
@@ -18,7 +28,7 @@ class Feedstock:
         assert 0.5 <= self.sulfur_wt_pct <= 8, f"Sulfur {self.sulfur_wt_pct} out of range"
         assert 0 <= self.oxygen_wt_pct <= 5, f"Oxygen {self.oxygen_wt_pct} out of range"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProcessConditions:
     """Carbonization Process Parameters"""
     temp_C: float = 1100
@@ -31,7 +41,7 @@ class ProcessConditions:
         assert 0.5 <= self.rate_C_min <= 50, f"Rate {self.rate_C_min} out of range"
         assert 0.25 <= self.time_hr <= 10, f"Time {self.time_hr} out of range"
 
-@dataclass
+@dataclass(frozen=True)
 class HardCarbonResult:
     """Predicted Hard Carbon Properties"""
     d002_nm: float
@@ -39,38 +49,158 @@ class HardCarbonResult:
     ice_pct: float
     bet_m2_g: float
     yield_pct: float
-    in_goldilocks: bool = field(init=False)
-    quality_score: float = field(init=False)
-    grade: str = field(init=False)
-    
-    def __post_init__(self):
-        self.in_goldilocks = 0.37 <= self.d002_nm <= 0.40
-        self._calc_score()
-        self._calc_grade()
-    
-    def _calc_score(self):
+
+    # Scoring is lazy: callers that only read the raw properties never
+    # pay for it. cached_property stores into the instance __dict__,
+    # which is why this dataclass (unlike the others) has no slots=True.
+
+    @cached_property
+    def in_goldilocks(self) -> bool:
+        return 0.37 <= self.d002_nm <= 0.40
+
+    @cached_property
+    def quality_score(self) -> float:
         """Quality score 0-100"""
-        score = 0
-        # d002 score (40 pts) - peak at 0.385
-        d002_dist = abs(self.d002_nm - 0.385)
-        score += max(0, 40 * (1 - d002_dist / 0.05))
-        # Capacity score (30 pts)
-        score += min(30, self.capacity_mAh_g / 10)
-        # ICE score (20 pts)
-        score += min(20, (self.ice_pct - 60) / 1.5) if self.ice_pct > 60 else 0
-        # Yield score (10 pts)
-        score += min(10, self.yield_pct / 4)
-        self.quality_score = round(score, 1)
-    
-    def _calc_grade(self):
-        if self.quality_score >= 80 and self.in_goldilocks:
-            self.grade = "Premium (A)"
-        elif self.quality_score >= 65 and self.in_goldilocks:
-            self.grade = "Standard (B)"
-        elif self.quality_score >= 50:
-            self.grade = "Acceptable (C)"
-        else:
-            self.grade = "Off-spec (D)"
+        return round(_score_core(self.d002_nm, self.capacity_mAh_g,
+                                 self.ice_pct, self.yield_pct), 1)
+
+    @cached_property
+    def grade(self) -> str:
+        return grade_for(self.quality_score, self.in_goldilocks)
+
+
+def grade_for(score: float, in_goldilocks: bool) -> str:
+    """Letter grade from quality score + Goldilocks flag"""
+    if score >= 80 and in_goldilocks:
+        return "Premium (A)"
+    elif score >= 65 and in_goldilocks:
+        return "Standard (B)"
+    elif score >= 50:
+        return "Acceptable (C)"
+    return "Off-spec (D)"
+
+
+def quality_score_batch(d002, cap, ice, yld):
+    """Vectorized quality score (0-100) over arrays of predicted properties"""
+    return np.round(_quality_score_batch_raw(d002, cap, ice, yld), 1)
+
+
+def _quality_score_batch_raw(d002, cap, ice, yld):
+    """quality_score_batch without the presentation rounding"""
+    score = np.maximum(0, 40 * (1 - np.abs(d002 - 0.385) / 0.05))
+    score += np.minimum(30, cap / 10)
+    score += np.where(ice > 60, np.minimum(20, (ice - 60) / 1.5), 0)
+    score += np.minimum(10, yld / 4)
+    return score
+
+# ============== PREDICTOR KERNELS ==============
+
+# Model coefficients as module-level floats: numba's nopython mode can
+# fold these into the compiled kernel, while class-level dicts cannot.
+# The class-level dicts on HardCarbonPredictor reference the same values.
+_D002_BASE, _D002_TEMP, _D002_SULFUR = 0.335, -3.5e-5, 0.012
+_D002_OXYGEN, _D002_RATE, _D002_TIME = 0.006, 0.0006, -0.004
+_CAP_PEAK, _CAP_OPT, _CAP_SIGMA, _CAP_BASE = 320.0, 0.385, 0.018, 80.0
+_CAP_SPAN = _CAP_PEAK - _CAP_BASE
+_CAP_INV_2SIGMA2 = 1.0 / (2.0 * _CAP_SIGMA**2)
+_ICE_MAX, _ICE_SLOPE, _ICE_MIN = 92.0, -1.0, 55.0
+_BET_BASE, _BET_TEMP, _BET_RATE, _BET_TIME = 40.0, -0.025, 0.4, -3.0
+_YLD_BASE, _YLD_MCR, _YLD_AROM, _YLD_TEMP = 20.0, 0.6, 0.12, -0.008
+
+
+def _predict_core(s, o, a, mcr, T, rate, hold):
+    """
+    Pure-math predictor core → (d002, cap, ice, bet, yld) floats.
+
+    Deliberately left un-jitted: one-shot CLI predictions stay free of
+    any JIT warmup, while batch workloads go through the compiled
+    _predict_core_batch below. An AOT extension (Cython/mypyc) was
+    considered and rejected to keep the pure-Python wheel.
+    """
+    d002 = (_D002_BASE + _D002_TEMP * (T - 1000.0) + _D002_SULFUR * s +
+            _D002_OXYGEN * o + _D002_RATE * rate + _D002_TIME * hold)
+    if d002 < 0.335:
+        d002 = 0.335
+    elif d002 > 0.42:
+        d002 = 0.42
+    dx = d002 - _CAP_OPT
+    cap = _CAP_BASE + _CAP_SPAN * math.exp(-dx * dx * _CAP_INV_2SIGMA2)
+    bet = _BET_BASE + _BET_TEMP * (T - 1000.0) + _BET_RATE * rate + _BET_TIME * hold
+    if bet < 1.0:
+        bet = 1.0
+    elif bet > 80.0:
+        bet = 80.0
+    ice = _ICE_MAX + _ICE_SLOPE * bet
+    if ice < _ICE_MIN:
+        ice = _ICE_MIN
+    elif ice > _ICE_MAX:
+        ice = _ICE_MAX
+    yld = _YLD_BASE + _YLD_MCR * mcr + _YLD_AROM * a + _YLD_TEMP * (T - 1000.0)
+    if yld < 15.0:
+        yld = 15.0
+    elif yld > 50.0:
+        yld = 50.0
+    return d002, cap, ice, bet, yld
+
+
+def _score_core(d002, cap, ice, yld):
+    """Scalar quality score (0-100); same math as quality_score_batch"""
+    score = 40.0 * (1.0 - abs(d002 - 0.385) / 0.05)
+    if score < 0.0:
+        score = 0.0
+    part = cap / 10.0
+    score += 30.0 if part > 30.0 else part
+    if ice > 60.0:
+        part = (ice - 60.0) / 1.5
+        score += 20.0 if part > 20.0 else part
+    part = yld / 4.0
+    score += 10.0 if part > 10.0 else part
+    return score
+
+
+if _HAS_NUMBA:
+    # cache=True persists the compiled kernels to disk so Streamlit
+    # reruns / fresh CLI processes skip the JIT warmup. The jitted
+    # copies of the scalar cores exist only for inlining into the
+    # batch loops.
+    _predict_core_jit = njit(cache=True, fastmath=True)(_predict_core)
+    _score_core_jit = njit(cache=True, fastmath=True)(_score_core)
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _predict_core_batch(sulfurs, o, a, mcr, temps, rates, times):
+        """Array predictor core: parallel loop over same-length 1-D arrays"""
+        n = temps.shape[0]
+        d002 = np.empty(n)
+        cap = np.empty(n)
+        ice = np.empty(n)
+        bet = np.empty(n)
+        yld = np.empty(n)
+        for k in prange(n):
+            d002[k], cap[k], ice[k], bet[k], yld[k] = _predict_core_jit(
+                sulfurs[k], o, a, mcr, temps[k], rates[k], times[k])
+        return d002, cap, ice, bet, yld
+
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _sweep_core_batch(sulfurs, o, a, mcr, temps, rates, times):
+        """
+        Predict + score fused into one parallel scalar loop. An explicit
+        loop beats chained array expressions here: no temporaries, and
+        LLVM vectorizes the straight-line scalar math.
+        """
+        n = temps.shape[0]
+        d002 = np.empty(n)
+        cap = np.empty(n)
+        ice = np.empty(n)
+        bet = np.empty(n)
+        yld = np.empty(n)
+        score = np.empty(n)
+        for k in prange(n):
+            d002[k], cap[k], ice[k], bet[k], yld[k] = _predict_core_jit(
+                sulfurs[k], o, a, mcr, temps[k], rates[k], times[k])
+            # no round() here: fastmath breaks correct rounding, and the
+            # sweep convention is to round only at materialization
+            score[k] = _score_core_jit(d002[k], cap[k], ice[k], yld[k])
+        return d002, cap, ice, bet, yld, score
 
 # ============== PREDICTORS ==============
 
@@ -88,78 +218,157 @@ class HardCarbonPredictor:
     
     # d002 coefficients (calibrate with your Paper 5 data)
     D002 = {
-        'base': 0.335,      # graphite baseline
-        'temp': -3.5e-5,    # per °C above 1000
-        'sulfur': 0.012,    # per wt% S
-        'oxygen': 0.006,    # per wt% O
-        'rate': 0.0006,     # per °C/min
-        'time': -0.004,     # per hour
+        'base': _D002_BASE,     # graphite baseline
+        'temp': _D002_TEMP,     # per °C above 1000
+        'sulfur': _D002_SULFUR, # per wt% S
+        'oxygen': _D002_OXYGEN, # per wt% O
+        'rate': _D002_RATE,     # per °C/min
+        'time': _D002_TIME,     # per hour
     }
-    
+
     # Capacity peaks at optimal d002
-    CAP = {'peak': 320, 'optimal_d002': 0.385, 'sigma': 0.018, 'base': 80}
-    
+    CAP = {'peak': _CAP_PEAK, 'optimal_d002': _CAP_OPT, 'sigma': _CAP_SIGMA, 'base': _CAP_BASE}
+
     # ICE decreases with BET surface area
-    ICE = {'max': 92, 'slope': -1.0, 'min': 55}
-    
+    ICE = {'max': _ICE_MAX, 'slope': _ICE_SLOPE, 'min': _ICE_MIN}
+
     # BET depends on process severity
-    BET = {'base': 40, 'temp': -0.025, 'rate': 0.4, 'time': -3}
-    
+    BET = {'base': _BET_BASE, 'temp': _BET_TEMP, 'rate': _BET_RATE, 'time': _BET_TIME}
+
     # Yield depends on feedstock
-    YLD = {'base': 20, 'mcr': 0.6, 'arom': 0.12, 'temp': -0.008}
+    YLD = {'base': _YLD_BASE, 'mcr': _YLD_MCR, 'arom': _YLD_AROM, 'temp': _YLD_TEMP}
     
     def predict_d002(self, feed: Feedstock, proc: ProcessConditions) -> float:
         """Predict interlayer spacing (nm)"""
-        d = self.D002
-        d002 = (d['base'] + 
-                d['temp'] * (proc.temp_C - 1000) +
-                d['sulfur'] * feed.sulfur_wt_pct +
-                d['oxygen'] * feed.oxygen_wt_pct +
-                d['rate'] * proc.rate_C_min +
-                d['time'] * proc.time_hr)
-        return np.clip(d002, 0.335, 0.42)
-    
+        d002 = (_D002_BASE +
+                _D002_TEMP * (proc.temp_C - 1000) +
+                _D002_SULFUR * feed.sulfur_wt_pct +
+                _D002_OXYGEN * feed.oxygen_wt_pct +
+                _D002_RATE * proc.rate_C_min +
+                _D002_TIME * proc.time_hr)
+        # builtin max/min: np.clip on a lone scalar costs a full ufunc
+        # dispatch for no benefit
+        return max(0.335, min(0.42, d002))
+
     def predict_capacity(self, d002: float) -> float:
         """Predict reversible capacity (mAh/g) from d002"""
-        c = self.CAP
-        cap = c['base'] + (c['peak'] - c['base']) * np.exp(
-            -((d002 - c['optimal_d002'])**2) / (2 * c['sigma']**2))
-        return cap
-    
+        # math.exp beats np.exp by an order of magnitude on scalars
+        dx = d002 - _CAP_OPT
+        return _CAP_BASE + _CAP_SPAN * math.exp(-dx * dx * _CAP_INV_2SIGMA2)
+
     def predict_bet(self, proc: ProcessConditions) -> float:
         """Predict BET surface area (m²/g)"""
-        b = self.BET
-        bet = (b['base'] + 
-               b['temp'] * (proc.temp_C - 1000) +
-               b['rate'] * proc.rate_C_min +
-               b['time'] * proc.time_hr)
-        return np.clip(bet, 1, 80)
-    
+        bet = (_BET_BASE +
+               _BET_TEMP * (proc.temp_C - 1000) +
+               _BET_RATE * proc.rate_C_min +
+               _BET_TIME * proc.time_hr)
+        return max(1, min(80, bet))
+
     def predict_ice(self, bet: float) -> float:
         """Predict Initial Coulombic Efficiency (%)"""
-        i = self.ICE
-        ice = i['max'] + i['slope'] * bet
-        return np.clip(ice, i['min'], i['max'])
-    
+        ice = _ICE_MAX + _ICE_SLOPE * bet
+        return max(_ICE_MIN, min(_ICE_MAX, ice))
+
     def predict_yield(self, feed: Feedstock, proc: ProcessConditions) -> float:
         """Predict char yield (wt%)"""
-        y = self.YLD
-        yld = (y['base'] + 
-               y['mcr'] * feed.mcr_wt_pct +
-               y['arom'] * feed.aromatics_pct +
-               y['temp'] * (proc.temp_C - 1000))
-        return np.clip(yld, 15, 50)
+        yld = (_YLD_BASE +
+               _YLD_MCR * feed.mcr_wt_pct +
+               _YLD_AROM * feed.aromatics_pct +
+               _YLD_TEMP * (proc.temp_C - 1000))
+        return max(15, min(50, yld))
     
+    def predict_d002_batch(self, feed: Feedstock, temps, rates, times, sulfur=None):
+        """
+        Vectorized predict_d002 only. d002 is the cheapest property and
+        the Goldilocks gate, so sweeps can compute it first and reserve
+        the full predict_batch for surviving samples.
+        """
+        if sulfur is None:
+            sulfur = feed.sulfur_wt_pct
+        return np.clip(_D002_BASE +
+                       _D002_TEMP * (temps - 1000) +
+                       _D002_SULFUR * sulfur +
+                       _D002_OXYGEN * feed.oxygen_wt_pct +
+                       _D002_RATE * rates +
+                       _D002_TIME * times, 0.335, 0.42)
+
+    def predict_batch(self, feed: Feedstock, temps, rates, times, sulfur=None) -> Tuple:
+        """
+        Vectorized predict() over NumPy arrays of process conditions.
+
+        temps/rates/times are same-shape ndarrays; returns a tuple of
+        (d002, capacity, ice, bet, yield) arrays of that shape. One
+        C-level pass replaces N scalar predict() calls in sweep loops.
+        `sulfur` optionally overrides feed.sulfur_wt_pct with a
+        per-sample array (used by the temperature-sulfur contour grid).
+        """
+        if sulfur is None:
+            sulfur = feed.sulfur_wt_pct
+        if _HAS_NUMBA:
+            temps = np.ascontiguousarray(temps, dtype=np.float64)
+            sulfurs = np.ascontiguousarray(
+                np.broadcast_to(np.asarray(sulfur, dtype=np.float64), temps.shape))
+            return _predict_core_batch(
+                sulfurs, feed.oxygen_wt_pct,
+                feed.aromatics_pct, feed.mcr_wt_pct,
+                temps,
+                np.ascontiguousarray(rates, dtype=np.float64),
+                np.ascontiguousarray(times, dtype=np.float64))
+        d002 = np.clip(_D002_BASE +
+                       _D002_TEMP * (temps - 1000) +
+                       _D002_SULFUR * sulfur +
+                       _D002_OXYGEN * feed.oxygen_wt_pct +
+                       _D002_RATE * rates +
+                       _D002_TIME * times, 0.335, 0.42)
+        cap = _CAP_BASE + _CAP_SPAN * np.exp(
+            -((d002 - _CAP_OPT)**2) * _CAP_INV_2SIGMA2)
+        bet = np.clip(_BET_BASE +
+                      _BET_TEMP * (temps - 1000) +
+                      _BET_RATE * rates +
+                      _BET_TIME * times, 1, 80)
+        ice = np.clip(_ICE_MAX + _ICE_SLOPE * bet, _ICE_MIN, _ICE_MAX)
+        yld = np.clip(_YLD_BASE +
+                      _YLD_MCR * feed.mcr_wt_pct +
+                      _YLD_AROM * feed.aromatics_pct +
+                      _YLD_TEMP * (temps - 1000), 15, 50)
+        return d002, cap, ice, bet, yld
+
+    def sweep_batch(self, feed: Feedstock, temps, rates, times, sulfur=None) -> Tuple:
+        """
+        predict_batch plus the quality score in one pass:
+        (d002, capacity, ice, bet, yield, score). With numba the score
+        is fused into the prediction loop; without it this is simply
+        predict_batch followed by quality_score_batch. Scores are for
+        ranking and may carry float noise — round at presentation.
+        """
+        if _HAS_NUMBA:
+            if sulfur is None:
+                sulfur = feed.sulfur_wt_pct
+            temps = np.ascontiguousarray(temps, dtype=np.float64)
+            sulfurs = np.ascontiguousarray(
+                np.broadcast_to(np.asarray(sulfur, dtype=np.float64), temps.shape))
+            return _sweep_core_batch(
+                sulfurs, feed.oxygen_wt_pct,
+                feed.aromatics_pct, feed.mcr_wt_pct,
+                temps,
+                np.ascontiguousarray(rates, dtype=np.float64),
+                np.ascontiguousarray(times, dtype=np.float64))
+        d002, cap, ice, bet, yld = self.predict_batch(feed, temps, rates, times, sulfur=sulfur)
+        # raw variant: keep fallback scores unrounded like the numba path
+        return d002, cap, ice, bet, yld, _quality_score_batch_raw(d002, cap, ice, yld)
+
     def predict(self, feed: Feedstock, proc: ProcessConditions) -> HardCarbonResult:
         """Run all predictions"""
-        d002 = self.predict_d002(feed, proc)
-        bet = self.predict_bet(proc)
+        d002, cap, ice, bet, yld = _predict_core(
+            feed.sulfur_wt_pct, feed.oxygen_wt_pct,
+            feed.aromatics_pct, feed.mcr_wt_pct,
+            proc.temp_C, proc.rate_C_min, proc.time_hr)
         return HardCarbonResult(
             d002_nm=round(d002, 4),
-            capacity_mAh_g=round(self.predict_capacity(d002), 1),
-            ice_pct=round(self.predict_ice(bet), 1),
+            capacity_mAh_g=round(cap, 1),
+            ice_pct=round(ice, 1),
             bet_m2_g=round(bet, 1),
-            yield_pct=round(self.predict_yield(feed, proc), 1)
+            yield_pct=round(yld, 1)
         )
 
 # ============== GOLDILOCKS ANALYZER ==============
@@ -198,20 +407,25 @@ class GoldilocksAnalyzer:
     
     def find_temp_window(self, feed: Feedstock, rate: float = 5, time: float = 2) -> Dict:
         """Find temperature range that hits Goldilocks"""
-        predictor = HardCarbonPredictor()
-        goldilocks_temps = []
-        
-        for T in range(850, 1350, 10):
-            proc = ProcessConditions(temp_C=T, rate_C_min=rate, time_hr=time)
-            d002 = predictor.predict_d002(feed, proc)
-            if self.D002_MIN <= d002 <= self.D002_MAX:
-                goldilocks_temps.append(T)
-        
-        if goldilocks_temps:
+        # d002 is linear in temperature, so the window follows in closed
+        # form from the temperature-independent part K:
+        # d002(T) = K + tc*(T - 1000), with tc < 0 flipping the bounds.
+        tc = _D002_TEMP
+        K = (_D002_BASE + _D002_SULFUR * feed.sulfur_wt_pct +
+             _D002_OXYGEN * feed.oxygen_wt_pct + _D002_RATE * rate + _D002_TIME * time)
+        t_lo = 1000 + (self.D002_MAX - K) / tc   # hotter than this: d002 <= MAX
+        t_hi = 1000 + (self.D002_MIN - K) / tc   # cooler than this: d002 >= MIN
+        # Snap inward to the 10C survey grid on [850, 1340]; the 1e-9
+        # slack keeps grid points that sit exactly on a window boundary
+        # (inclusive in the scan) from being dropped by float error
+        min_temp = max(850, 10 * math.ceil(t_lo / 10 - 1e-9))
+        max_temp = min(1340, 10 * math.floor(t_hi / 10 + 1e-9))
+
+        if min_temp <= max_temp:
             return {
-                'min_temp': min(goldilocks_temps),
-                'max_temp': max(goldilocks_temps),
-                'optimal_temp': (min(goldilocks_temps) + max(goldilocks_temps)) // 2,
-                'window_width': max(goldilocks_temps) - min(goldilocks_temps)
+                'min_temp': min_temp,
+                'max_temp': max_temp,
+                'optimal_temp': (min_temp + max_temp) // 2,
+                'window_width': max_temp - min_temp
             }
         return {'min_temp': None, 'max_temp': None, 'optimal_temp': None, 'window_width': 0}
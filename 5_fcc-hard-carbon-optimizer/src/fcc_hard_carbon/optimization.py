@@ -3,11 +3,17 @@ import numpy as np
 from scipy.stats import qmc
 from typing import List, Dict, Tuple
 from dataclasses import dataclass
-import pandas as pd
 
-from .models import Feedstock, ProcessConditions, HardCarbonPredictor
+from .models import (Feedstock, ProcessConditions, HardCarbonPredictor, grade_for,
+                     _CAP_BASE, _CAP_SPAN, _CAP_OPT, _CAP_INV_2SIGMA2,
+                     _D002_BASE, _D002_TEMP, _D002_SULFUR, _D002_OXYGEN,
+                     _D002_RATE, _D002_TIME)
 
-@dataclass
+# The predictor is stateless (methods read module/class constants), so
+# one shared instance serves every optimizer and analyzer.
+_PREDICTOR = HardCarbonPredictor()
+
+@dataclass(frozen=True, slots=True)
 class OptResult:
     """Optimization result"""
     temp_C: float
@@ -24,46 +30,125 @@ class OptResult:
 class ProcessOptimizer:
     """Find optimal process conditions via Latin Hypercube Sampling"""
     
-    def __init__(self, feedstock: Feedstock, temp_range=(900,1300), rate_range=(1,20), time_range=(0.5,4), seed=42):
+    def __init__(self, feedstock: Feedstock, temp_range=(900,1300), rate_range=(1,20), time_range=(0.5,4),
+                 seed=42, lhs_optimization=None):
         self.feed = feedstock
         self.temp_range = temp_range
         self.rate_range = rate_range
         self.time_range = time_range
         self.seed = seed
-        self.predictor = HardCarbonPredictor()
-        self.all_results: List[OptResult] = []
-    
+        # 'random-cd' / 'lloyd' improve space-filling (Morris-Mitchell
+        # maximin) so small budgets need fewer samples, but design
+        # optimization itself costs ~1s at n=1000 — opt-in only.
+        self.lhs_optimization = lhs_optimization
+        self.predictor = _PREDICTOR
+        # SoA layout: one array per field for every evaluated sample;
+        # OptResult objects exist only for the returned top N.
+        self.arrays: Dict[str, np.ndarray] = {}
+
+    def _sample(self, n_samples: int, lo=None, hi=None, seed=None):
+        """Draw the LHS design scaled to the process box → (temps, rates, times)"""
+        if lo is None:
+            lo = [self.temp_range[0], self.rate_range[0], self.time_range[0]]
+        if hi is None:
+            hi = [self.temp_range[1], self.rate_range[1], self.time_range[1]]
+        # Explicit PCG64 generator: fast bulk uniforms and a fixed seed,
+        # so repeated runs (and cache keys built on the inputs) agree.
+        rng = np.random.default_rng(self.seed if seed is None else seed)
+        try:
+            sampler = qmc.LatinHypercube(d=3, seed=rng, optimization=self.lhs_optimization)
+        except TypeError:  # scipy < 1.8 has no optimization kwarg
+            sampler = qmc.LatinHypercube(d=3, seed=rng)
+        X = qmc.scale(sampler.random(n_samples), lo, hi)
+        return X[:,0], X[:,1], X[:,2]
+
     def optimize(self, n_samples: int = 1000, top_n: int = 10) -> List[OptResult]:
         """Run LHS optimization and return top N Goldilocks conditions"""
-        sampler = qmc.LatinHypercube(d=3, seed=self.seed)
-        unit = sampler.random(n_samples)
-        
-        temps = self.temp_range[0] + unit[:,0] * (self.temp_range[1] - self.temp_range[0])
-        rates = self.rate_range[0] + unit[:,1] * (self.rate_range[1] - self.rate_range[0])
-        times = self.time_range[0] + unit[:,2] * (self.time_range[1] - self.time_range[0])
-        
-        self.all_results = []
-        for t, r, h in zip(temps, rates, times):
-            pc = ProcessConditions(temp_C=t, rate_C_min=r, time_hr=h)
-            res = self.predictor.predict(self.feed, pc)
-            self.all_results.append(OptResult(
-                temp_C=round(t,1), rate_C_min=round(r,1), time_hr=round(h,2),
-                d002_nm=res.d002_nm, capacity=res.capacity_mAh_g, ice_pct=res.ice_pct,
-                yield_pct=res.yield_pct, score=res.quality_score, grade=res.grade,
-                in_goldilocks=res.in_goldilocks
-            ))
-        
-        goldilocks = sorted([r for r in self.all_results if r.in_goldilocks], 
-                           key=lambda x: x.score, reverse=True)
-        return goldilocks[:top_n]
-    
+        temps, rates, times = self._sample(n_samples)
+        return self._collect(temps, rates, times, top_n)
+
+    def optimize_adaptive(self, n_samples: int = 500, top_n: int = 10,
+                          n_phases: int = 3) -> List[OptResult]:
+        """
+        Multi-phase LHS refinement: sample, shrink the box 2x around the
+        incumbent best, resample. Evaluations concentrate near the
+        optimum, so roughly half the budget of optimize() reaches the
+        same top score. Ranking covers all points from all phases.
+        """
+        full_lo = np.array([self.temp_range[0], self.rate_range[0], self.time_range[0]], dtype=float)
+        full_hi = np.array([self.temp_range[1], self.rate_range[1], self.time_range[1]], dtype=float)
+        lo, hi = full_lo.copy(), full_hi.copy()
+        per_phase = max(1, n_samples // n_phases)
+        # Independent, reproducible per-phase streams from one seed
+        phase_seeds = np.random.SeedSequence(self.seed).spawn(n_phases)
+
+        all_X = []
+        for phase in range(n_phases):
+            X = np.column_stack(self._sample(per_phase, lo, hi, seed=phase_seeds[phase]))
+            all_X.append(X)
+
+            d002, _, _, _, _, score = self.predictor.sweep_batch(
+                self.feed, X[:,0], X[:,1], X[:,2])
+            in_gl = (d002 >= 0.37) & (d002 <= 0.40)
+            best = X[np.argmax(np.where(in_gl, score, -np.inf))] if in_gl.any() \
+                else X[np.argmax(score)]
+
+            # Halve the box around the incumbent, clipped to the full box
+            span = (hi - lo) / 4
+            lo = np.maximum(full_lo, best - span)
+            hi = np.minimum(full_hi, best + span)
+
+        X = np.vstack(all_X)
+        return self._collect(X[:,0], X[:,1], X[:,2], top_n)
+
+    def _collect(self, temps, rates, times, top_n: int) -> List[OptResult]:
+        """Evaluate sampled conditions, record results, return top N"""
+        # d002 is the cheap Goldilocks gate: compute it for everything,
+        # then the remaining properties only for surviving samples.
+        d002 = self.predictor.predict_d002_batch(self.feed, temps, rates, times)
+        in_gl = (d002 >= 0.37) & (d002 <= 0.40)
+        gl_idx = np.where(in_gl)[0]
+
+        n = len(temps)
+        cap = np.full(n, np.nan)
+        ice = np.full(n, np.nan)
+        bet = np.full(n, np.nan)
+        yld = np.full(n, np.nan)
+        score = np.full(n, -np.inf)
+        if gl_idx.size:
+            _, cap_gl, ice_gl, bet_gl, yld_gl, score_gl = self.predictor.sweep_batch(
+                self.feed, temps[gl_idx], rates[gl_idx], times[gl_idx])
+            cap[gl_idx], ice[gl_idx], bet[gl_idx], yld[gl_idx] = cap_gl, ice_gl, bet_gl, yld_gl
+            score[gl_idx] = score_gl
+
+        self.arrays = {'temp': temps, 'rate': rates, 'time': times,
+                       'd002': d002, 'capacity': cap, 'ice': ice, 'bet': bet,
+                       'yield': yld, 'score': score, 'in_goldilocks': in_gl}
+
+        # argpartition selects the winners in O(g); only those top_n get
+        # the full sort, instead of ranking every survivor.
+        s = score[gl_idx]
+        part = np.argpartition(-s, top_n)[:top_n] if gl_idx.size > top_n \
+            else np.arange(gl_idx.size)
+        top_idx = gl_idx[part[np.argsort(-s[part])]]
+        return [OptResult(
+            temp_C=round(temps[i],1), rate_C_min=round(rates[i],1), time_hr=round(times[i],2),
+            d002_nm=round(d002[i],4), capacity=round(cap[i],1), ice_pct=round(ice[i],1),
+            yield_pct=round(yld[i],1), score=round(float(score[i]),1),
+            grade=grade_for(score[i], True),
+            in_goldilocks=True
+        ) for i in top_idx]
+
     def get_stats(self) -> Dict:
-        gl = [r for r in self.all_results if r.in_goldilocks]
+        a = self.arrays
+        if not a:
+            return {'total': 0, 'goldilocks': 0, 'rate_pct': 0, 'best_score': 0, 'best_cap': 0}
+        in_gl = a['in_goldilocks']
         return {
-            'total': len(self.all_results), 'goldilocks': len(gl),
-            'rate_pct': len(gl)/len(self.all_results)*100 if self.all_results else 0,
-            'best_score': max((r.score for r in gl), default=0),
-            'best_cap': max((r.capacity for r in gl), default=0)
+            'total': len(in_gl), 'goldilocks': int(in_gl.sum()),
+            'rate_pct': float(in_gl.mean()) * 100,
+            'best_score': round(float(a['score'][in_gl].max()), 1) if in_gl.any() else 0,
+            'best_cap': round(float(a['capacity'][in_gl].max()), 1) if in_gl.any() else 0
         }
 
 class SensitivityAnalyzer:
@@ -72,61 +157,59 @@ class SensitivityAnalyzer:
     def __init__(self, feedstock: Feedstock, base_proc: ProcessConditions):
         self.feed = feedstock
         self.base = base_proc
-        self.pred = HardCarbonPredictor()
+        self.pred = _PREDICTOR
         self.base_d002 = self.pred.predict_d002(feedstock, base_proc)
     
     def analyze(self, pct: float = 20) -> List[Dict]:
         """Analyze ±pct% variation in each parameter"""
+        b, f = self.base, self.feed
+        lo, hi = 1 - pct/100, 1 + pct/100
+
+        # d002 is linear in every perturbed parameter, so each delta is
+        # one coefficient times the parameter change (re-clipped) — no
+        # predictor dispatch or array temporaries for 8 scalars.
+        base_raw = (_D002_BASE + _D002_TEMP * (b.temp_C - 1000) +
+                    _D002_SULFUR * f.sulfur_wt_pct + _D002_OXYGEN * f.oxygen_wt_pct +
+                    _D002_RATE * b.rate_C_min + _D002_TIME * b.time_hr)
+        cases = [
+            ('Temperature', _D002_TEMP, b.temp_C,
+             b.temp_C * lo, b.temp_C * hi),
+            ('Heating Rate', _D002_RATE, b.rate_C_min,
+             max(1, b.rate_C_min * lo), min(20, b.rate_C_min * hi)),
+            ('Hold Time', _D002_TIME, b.time_hr,
+             max(0.5, b.time_hr * lo), min(6, b.time_hr * hi)),
+            ('Sulfur', _D002_SULFUR, f.sulfur_wt_pct,
+             max(1, f.sulfur_wt_pct * lo), min(6, f.sulfur_wt_pct * hi)),
+        ]
         results = []
-        
-        # Temperature
-        low = self.base.temp_C * (1 - pct/100)
-        high = self.base.temp_C * (1 + pct/100)
-        d_low = self.pred.predict_d002(self.feed, ProcessConditions(temp_C=low, rate_C_min=self.base.rate_C_min, time_hr=self.base.time_hr))
-        d_high = self.pred.predict_d002(self.feed, ProcessConditions(temp_C=high, rate_C_min=self.base.rate_C_min, time_hr=self.base.time_hr))
-        results.append({'param': 'Temperature', 'low': d_low - self.base_d002, 'high': d_high - self.base_d002})
-        
-        # Heating rate
-        low = max(1, self.base.rate_C_min * (1 - pct/100))
-        high = min(20, self.base.rate_C_min * (1 + pct/100))
-        d_low = self.pred.predict_d002(self.feed, ProcessConditions(temp_C=self.base.temp_C, rate_C_min=low, time_hr=self.base.time_hr))
-        d_high = self.pred.predict_d002(self.feed, ProcessConditions(temp_C=self.base.temp_C, rate_C_min=high, time_hr=self.base.time_hr))
-        results.append({'param': 'Heating Rate', 'low': d_low - self.base_d002, 'high': d_high - self.base_d002})
-        
-        # Hold time
-        low = max(0.5, self.base.time_hr * (1 - pct/100))
-        high = min(6, self.base.time_hr * (1 + pct/100))
-        d_low = self.pred.predict_d002(self.feed, ProcessConditions(temp_C=self.base.temp_C, rate_C_min=self.base.rate_C_min, time_hr=low))
-        d_high = self.pred.predict_d002(self.feed, ProcessConditions(temp_C=self.base.temp_C, rate_C_min=self.base.rate_C_min, time_hr=high))
-        results.append({'param': 'Hold Time', 'low': d_low - self.base_d002, 'high': d_high - self.base_d002})
-        
-        # Sulfur
-        low = max(1, self.feed.sulfur_wt_pct * (1 - pct/100))
-        high = min(6, self.feed.sulfur_wt_pct * (1 + pct/100))
-        d_low = self.pred.predict_d002(Feedstock(sulfur_wt_pct=low), self.base)
-        d_high = self.pred.predict_d002(Feedstock(sulfur_wt_pct=high), self.base)
-        results.append({'param': 'Sulfur', 'low': d_low - self.base_d002, 'high': d_high - self.base_d002})
-        
-        # Sort by impact
-        for r in results:
-            r['impact'] = abs(r['high'] - r['low'])
+        for param, coef, base_v, lo_v, hi_v in cases:
+            d_lo = max(0.335, min(0.42, base_raw + coef * (lo_v - base_v)))
+            d_hi = max(0.335, min(0.42, base_raw + coef * (hi_v - base_v)))
+            results.append({'param': param, 'low': d_lo - self.base_d002,
+                            'high': d_hi - self.base_d002,
+                            'impact': abs(d_hi - d_lo)})
         results.sort(key=lambda x: x['impact'], reverse=True)
         return results
 
 def generate_contour_data(feed: Feedstock, temp_range=(900,1300), sulfur_range=(1,6), n=30):
     """Generate grid data for contour plots"""
-    pred = HardCarbonPredictor()
+    pred = _PREDICTOR
     temps = np.linspace(temp_range[0], temp_range[1], n)
     sulfurs = np.linspace(sulfur_range[0], sulfur_range[1], n)
-    
-    d002 = np.zeros((n, n))
-    cap = np.zeros((n, n))
-    
-    for i, s in enumerate(sulfurs):
-        for j, t in enumerate(temps):
-            r = pred.predict(Feedstock(sulfur_wt_pct=s, oxygen_wt_pct=feed.oxygen_wt_pct), 
-                            ProcessConditions(temp_C=t))
-            d002[i,j] = r.d002_nm
-            cap[i,j] = r.capacity_mAh_g
-    
-    return {'temps': temps, 'sulfurs': sulfurs, 'd002': d002, 'capacity': cap}
+
+    # Broadcast the (n,1) sulfur column against the (1,n) temperature
+    # row directly: rows vary sulfur, columns vary temperature, with no
+    # meshgrid copies or flattened rate/time temporaries.
+    proc = ProcessConditions()  # default rate/time, as before
+    d002 = pred.predict_d002_batch(feed, temps[None, :], proc.rate_C_min,
+                                   proc.time_hr, sulfur=sulfurs[:, None])
+    cap = _CAP_BASE + _CAP_SPAN * np.exp(
+        -((d002 - _CAP_OPT)**2) * _CAP_INV_2SIGMA2)
+
+    # Predictor math stays float64; results are stored as float32 views
+    # into one contiguous buffer, halving the payload Plotly serializes.
+    buf = np.empty((2, n, n), dtype=np.float32)
+    buf[0] = d002
+    buf[1] = cap
+    return {'temps': temps.astype(np.float32), 'sulfurs': sulfurs.astype(np.float32),
+            'd002': buf[0], 'capacity': buf[1]}
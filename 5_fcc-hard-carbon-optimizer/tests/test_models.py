@@ -71,6 +71,43 @@ def test_find_temp_window():
     assert window['min_temp'] < window['max_temp'], "min < max"
     print(f"✅ Temp window: {window['min_temp']}-{window['max_temp']}°C")
 
+def test_find_temp_window_boundary_parity():
+    """Closed-form window matches an exact-arithmetic boundary check"""
+    from fractions import Fraction as F
+    analyzer = GoldilocksAnalyzer()
+
+    # Exact rational copies of the d002 model. A float grid scan is NOT
+    # a valid reference at mathematically exact boundaries: summation
+    # noise can push d002 an epsilon outside [0.37, 0.40] and exclude a
+    # grid point the window genuinely contains (and the closed form,
+    # via its 1e-9 snap slack, correctly keeps).
+    base, tc, sc = F('0.335'), F('-0.000035'), F('0.012')
+    oc, rc, hc = F('0.006'), F('0.0006'), F('-0.004')
+    lo_b, hi_b = F('0.37'), F('0.40')
+
+    # (sulfur, oxygen, rate, time) as decimal strings; the first case
+    # puts d002 exactly on 0.37 at 1160°C, the fourth exactly on 0.40
+    # at 1180°C, and the last has no window at all
+    cases = [('3.5', '1.0', '1.0', '2.0'), ('3.5', '1.0', '5.0', '2.0'),
+             ('2.0', '0.5', '10.0', '1.0'), ('3.5', '5.0', '0.5', '0.25'),
+             ('5.0', '2.0', '15.0', '3.0')]
+    for s, o, rate, time in cases:
+        K = base + sc * F(s) + oc * F(o) + rc * F(rate) + hc * F(time)
+        grid = [t for t in range(850, 1350, 10)
+                if lo_b <= K + tc * (t - 1000) <= hi_b]
+
+        feed = Feedstock(sulfur_wt_pct=float(s), oxygen_wt_pct=float(o))
+        window = analyzer.find_temp_window(feed, rate=float(rate), time=float(time))
+        if grid:
+            assert window['min_temp'] == grid[0], \
+                f"min_temp mismatch for {(s, o, rate, time)}: {window}"
+            assert window['max_temp'] == grid[-1], \
+                f"max_temp mismatch for {(s, o, rate, time)}: {window}"
+        else:
+            assert window['min_temp'] is None and window['window_width'] == 0, \
+                f"Expected empty window for {(s, o, rate, time)}: {window}"
+    print(f"✅ Temp window matches exact boundary check ({len(cases)} cases)")
+
 if __name__ == '__main__':
     print("\n" + "="*50)
     print("FCC HARD CARBON OPTIMIZER - TESTS")
@@ -82,7 +119,8 @@ if __name__ == '__main__':
     test_capacity_peaks_at_optimal()
     test_quality_grading()
     test_find_temp_window()
-    
+    test_find_temp_window_boundary_parity()
+
     print("\n" + "="*50)
     print("ALL TESTS PASSED ✅")
     print("="*50 + "\n")
@@ -18,6 +18,20 @@ def test_lhs_optimization():
     assert top[0].score >= top[-1].score, "Should be sorted by score"
     print(f"✅ LHS: Found {stats['goldilocks']}/{stats['total']} in Goldilocks, Top score={top[0].score:.1f}")
 
+def test_adaptive_optimization():
+    """Adaptive refinement reaches full-LHS quality on half the budget"""
+    feed = Feedstock(sulfur_wt_pct=3.5)
+    opt = ProcessOptimizer(feed)
+    top = opt.optimize_adaptive(n_samples=300, top_n=5)
+
+    assert len(top) > 0, "Should return top conditions"
+    assert all(r.in_goldilocks for r in top), "All top should be in Goldilocks"
+    assert top[0].score >= top[-1].score, "Should be sorted by score"
+
+    baseline = ProcessOptimizer(feed).optimize(n_samples=600, top_n=1)[0].score
+    assert top[0].score >= baseline - 2, "Refined run should match full LHS quality"
+    print(f"✅ Adaptive: top score={top[0].score:.1f} vs baseline={baseline:.1f} at half budget")
+
 def test_sensitivity():
     """Sensitivity analysis identifies key parameters"""
     feed = Feedstock(sulfur_wt_pct=3.5)
@@ -62,6 +76,7 @@ if __name__ == '__main__':
     print("="*50 + "\n")
     
     test_lhs_optimization()
+    test_adaptive_optimization()
     test_sensitivity()
     test_contour_data()
     test_top_conditions_quality()